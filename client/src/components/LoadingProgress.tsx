@@ -1,7 +1,7 @@
 import { Box, Typography, LinearProgress, Fade } from '@mui/material';
 import { useEffect, useState } from 'react';
 
-export type LoadingStage = 'validating' | 'fetching' | 'parsing' | 'complete';
+export type LoadingStage = 'validating' | 'fetching' | 'complete';
 
 interface LoadingProgressProps {
   stage: LoadingStage;
@@ -11,7 +11,6 @@ interface LoadingProgressProps {
 const stages = {
   validating: { label: 'Validating URL...', progress: 25 },
   fetching: { label: 'Fetching video info...', progress: 60 },
-  parsing: { label: 'Processing...', progress: 90 },
   complete: { label: 'Done', progress: 100 },
 };
 
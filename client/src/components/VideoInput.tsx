@@ -50,14 +50,10 @@ const VideoInput: React.FC<VideoInputProps> = ({ onVideoInfo, onLoadingChange })
     abortControllerRef.current = new AbortController();
 
     try {
-      await new Promise(resolve => setTimeout(resolve, 300));
       setLoadingStage('fetching');
 
       const info = await getVideoInfo(normalizedUrl);
 
-      setLoadingStage('parsing');
-      await new Promise(resolve => setTimeout(resolve, 200));
-
       setLoadingStage('complete');
       onVideoInfo(info);
       toast.success('Video loaded!');
@@ -161,12 +161,22 @@ export const downloadVideo = async (
     console.log('Download started:', downloadId, filename);
 
     // Step 2: Track progress via SSE
-    let progressComplete = false;
-
-    if (onProgress) {
+    // Resolve straight from the SSE handlers, with or without a progress callback,
+    // so completion is seen the moment the server pushes it instead of on a poll tick.
+    // Resolves true once the server confirmed the file is ready.
+    const confirmedDone = await new Promise<boolean>((resolve, reject) => {
       const eventSource = new EventSource(`${API_BASE_URL}/api/video/progress/${downloadId}`);
       let lastProgressTime = Date.now();
 
+      const finish = (done = false) => {
+        clearTimeout(fallbackTimer);
+        eventSource.close();
+        resolve(done);
+      };
+
+      // Fallback: Close after 10 minutes
+      const fallbackTimer = setTimeout(finish, 600000);
+
       eventSource.onopen = () => {
         console.log('✅ Progress tracking connected');
       };
@@ -175,12 +185,20 @@ export const downloadVideo = async (
         try {
           const progressData = JSON.parse(event.data);
           lastProgressTime = Date.now();
-          onProgress(progressData);
 
-          if (progressData.progress >= 100 || progressData.done) {
-            console.log('✅ Download complete');
-            progressComplete = true;
+          if (progressData.status === 'Error' || progressData.status === 'NotFound') {
+            clearTimeout(fallbackTimer);
             eventSource.close();
+            reject(new Error(progressData.status === 'Error'
+              ? 'Download failed on the server'
+              : 'Download not found or expired'));
+            return;
+          }
+
+          onProgress?.(progressData);
+          if (progressData.done) {
+            console.log('✅ Download complete');
+            finish(true);
           }
         } catch (error) {
           console.error('❌ Progress parsing error:', error);
@@ -188,87 +206,33 @@ export const downloadVideo = async (
       };
 
       eventSource.onerror = (error) => {
-        // Check if we received the completion signal
-        if (progressComplete) {
-          eventSource.close();
-          return;
-        }
-
         // Check if we haven't received updates for a while but might be complete
         const timeSinceLastUpdate = Date.now() - lastProgressTime;
         if (timeSinceLastUpdate > 5000) {
           console.log('⚠️ Connection lost, checking completion status...');
-          progressComplete = true;
-          eventSource.close();
+          finish();
           return;
         }
 
         console.error('❌ Connection error:', error);
-        // Don't immediately fail - the download might still be in progress
-        // The polling mechanism below will handle checking completion
+        // Don't immediately fail - EventSource reconnects on its own
+        // and the download might still be in progress
       };
+    });
 
-      // Fallback: Close after 10 minutes
-      setTimeout(() => {
-        eventSource.close();
-        progressComplete = true; // Force completion on timeout
-      }, 600000);
-
-      // Step 3: Wait for download to complete
-      await new Promise((resolve) => {
-        const checkInterval = setInterval(() => {
-          if (progressComplete) {
-            clearInterval(checkInterval);
-            resolve(true);
-          }
-        }, 100); // Check every 100ms for faster response
-      });
-    } else {
-      // If no progress callback, just poll until download is done
-      console.log('No progress callback, polling for completion...');
-      await new Promise((resolve) => {
-        const checkInterval = setInterval(async () => {
-          try {
-            const statusResponse = await fetch(`${API_BASE_URL}/api/video/progress/${downloadId}`);
-            const reader = statusResponse.body?.getReader();
-            if (reader) {
-              const { value } = await reader.read();
-              if (value) {
-                const text = new TextDecoder().decode(value);
-                const match = text.match(/data: ({.*})/);
-                if (match) {
-                  const progressData = JSON.parse(match[1]);
-                  console.log('Polling progress:', progressData.progress);
-                  if (progressData.progress >= 100 || progressData.done) {
-                    reader.cancel();
-                    clearInterval(checkInterval);
-                    resolve(true);
-                  }
-                }
-              }
-            }
-          } catch (error) {
-            console.error('Polling error:', error);
-          }
-        }, 2000);
-      });
-    }
-
-    // Give the server a moment to finalize the file write
-    console.log('Download complete, waiting 2 seconds before retrieval...');
-    await new Promise(resolve => setTimeout(resolve, 2000));
-
-    // Step 4: Wait for file to be fully ready (merged)
-    // yt-dlp may still be merging fragments even after progress shows 100%
-    console.log('Waiting for file to be fully processed...');
-
+    // Step 4: The server sends done only from a Completed snapshot (merged and
+    // verified); unknown IDs get NotFound instead. So a confirmed stream goes
+    // straight to retrieval, and probing is a fallback for when the stream
+    // dropped or timed out before confirming.
     const maxRetries = 10;
     let retries = 0;
-    let fileReady = false;
+    let fileReady = confirmedDone;
+    if (!fileReady) console.log('Completion not confirmed, checking file status...');
 
     while (retries < maxRetries && !fileReady) {
       try {
-        // Check if file is ready by making a HEAD request  
+        // Check if file is ready by making a HEAD request
+        // (validateStatus resolves every status below 500, so 202/404 land here)
         const checkResponse = await api.head(`/api/video/file/${downloadId}`);
 
         // If we get a 200, file is ready
@@ -277,20 +241,23 @@ export const downloadVideo = async (
           console.log('File is ready for download!');
           break;
         }
+
+        // 202 means still processing; anything else may not be visible yet
+        console.log(`File not ready (HTTP ${checkResponse.status}), retry ${retries + 1}/${maxRetries}...`);
+        await new Promise(resolve => setTimeout(resolve, 2000)); // Wait 2 seconds
+        retries++;
       } catch (error: any) {
-        // 202 means still processing, wait and retry
-        if (error.response?.status === 202) {
-          console.log(`File still processing, retry ${retries + 1}/${maxRetries}...`);
-          await new Promise(resolve => setTimeout(resolve, 2000)); // Wait 2 seconds
-          retries++;
-        } else {
-          // Other errors, break and try to download anyway
-          console.warn('Error checking file status:', error.message);
-          break;
-        }
+        // Network errors and 5xx: stop probing and try to download anyway
+        console.warn('Error checking file status:', error.message);
+        break;
       }
     }
 
+    if (!fileReady) {
+      // Out of retries (or probing failed): try the download anyway, as before
+      console.warn('File readiness not confirmed, downloading anyway');
+    }
+
     // Step 5: Trigger download
     console.log(`Triggering download: ${API_BASE_URL}/api/video/file/${downloadId}`);
 
@@ -1,19 +1,23 @@
+// Load environment variables first: services read their configuration when
+// they are imported (and singletons are built), so .env must already be applied
+import 'dotenv/config';
 import express, { Application, Request, Response, NextFunction } from 'express';
 import cors from 'cors';
 import helmet from 'helmet';
 import compression from 'compression';
-import dotenv from 'dotenv';
-import crypto from 'crypto';
 import videoRoutes from './routes/video';
 import { errorHandler } from './middleware/errorHandler';
+import { IdGenerator } from './utils/validators';
 import logger from './utils/logger';
 
-// Load environment variables
-dotenv.config();
-
 const app: Application = express();
 const PORT = process.env.PORT || 5000;
 
+// Must outlive the idle timeout of the proxy in front (Render/nginx/ALB use
+// ~60s); Node's 5s default makes the proxy reuse sockets we already closed,
+// forcing fresh TCP+TLS handshakes and sporadic 502s
+const KEEP_ALIVE_TIMEOUT_MS = parseInt(process.env.KEEP_ALIVE_TIMEOUT_MS || '65000', 10);
+
 // Middleware
 // Enhanced Helmet configuration with explicit security headers
 app.use(helmet({
@@ -79,12 +83,14 @@ app.use(cors({
   maxAge: 86400
 }));
 
-app.use(express.json({ limit: '10mb' }));
-app.use(express.urlencoded({ extended: true, limit: '10mb' }));
+// Request bodies are only a URL plus a few options; a small cap means
+// oversized payloads are rejected before any parsing work is done
+app.use(express.json({ limit: '10kb' }));
+app.use(express.urlencoded({ extended: true, limit: '10kb' }));
 
 // Request ID middleware for tracking
 app.use((req: Request, res: Response, next: NextFunction) => {
-  (req as any).id = crypto.randomBytes(16).toString('hex');
+  (req as any).id = IdGenerator.generateRequestId();
   res.setHeader('X-Request-ID', (req as any).id);
   next();
 });
@@ -111,7 +117,7 @@ app.use('/api/video', videoRoutes);
 app.use(errorHandler);
 
 // Start server
-app.listen(PORT, () => {
+const server = app.listen(PORT, () => {
   const startupMsg = `🚀 Server running on port ${PORT}`;
   const envMsg = `📝 Environment: ${process.env.NODE_ENV || 'development'}`;
   const corsMsg = `🌐 CORS enabled for: ${process.env.CORS_ORIGIN || '*'}`;
@@ -126,4 +132,7 @@ app.listen(PORT, () => {
   logger.info(corsMsg);
 });
 
+server.keepAliveTimeout = KEEP_ALIVE_TIMEOUT_MS;
+server.headersTimeout = KEEP_ALIVE_TIMEOUT_MS + 1000; // Must exceed keepAliveTimeout
+
 export default app;
@@ -1,39 +1,154 @@
 import { Request, Response, NextFunction } from 'express';
+import { EventEmitter } from 'events';
 import videoService from '../services/videoService';
 import ytdlpService from '../services/ytdlpService';
 import downloadQueue from '../services/DownloadQueue';
 import logger from '../utils/logger';
-import { createReadStream, readdirSync, existsSync, mkdirSync } from 'fs';
-import { join, resolve } from 'path';
-import { PathValidator, IdGenerator, FilenameValidator } from '../utils/validators';
+import { readdirSync, existsSync, mkdirSync } from 'fs';
+import { opendir, readdir, stat, unlink } from 'fs/promises';
+import { basename, join, resolve } from 'path';
+import { PathValidator, IdGenerator, FilenameValidator, UrlValidator } from '../utils/validators';
+
+type DownloadProgress = { progress: number; eta: string; speed: string; done: boolean; status: string };
+
+// Immutable progress state plus its SSE frame, serialized once per update
+// and shared by every subscriber instead of re-encoded per connection
+interface ProgressSnapshot {
+  readonly data: Readonly<DownloadProgress>;
+  readonly frame: string;
+  readonly done: boolean;
+}
+
+// Header-sanitizing patterns for the ASCII fallback filename, compiled once
+const NON_PRINTABLE_ASCII_RE = /[^\x20-\x7E]/g;
+const QUOTES_AND_BACKSLASHES_RE = /["\\]/g;
+
+const toFrame = (data: object): string => `data: ${JSON.stringify(data)}\n\n`;
 
 // Store for tracking download progress
-// Store for tracking download progress
-const downloadProgress = new Map<string, { progress: number; eta: string; speed: string; done: boolean; maxProgress: number; status: string }>();
+const downloadProgress = new Map<string, ProgressSnapshot>();
+
+// Emits `downloadId` events on every progress change so SSE streams push instead of polling
+const progressEvents = new EventEmitter();
+progressEvents.setMaxListeners(0); // One listener per open SSE connection
+
+// Sent to SSE clients for IDs that are not (or no longer) tracked: unknown,
+// expired or from before a restart. Never `done` - only a real Completed
+// snapshot tells a client the file is ready.
+const NOT_FOUND_FRAME = toFrame({ progress: 0, eta: '', speed: '', done: false, status: 'NotFound' });
+
+const setProgress = (downloadId: string, progress: DownloadProgress): void => {
+  const snapshot: ProgressSnapshot = {
+    data: Object.freeze(progress),
+    frame: toFrame(progress),
+    done: progress.done
+  };
+  downloadProgress.set(downloadId, snapshot);
+  progressEvents.emit(downloadId, snapshot.frame, snapshot.done);
+};
 
-// Run cleanup on startup
-const cleanupTempFiles = () => {
-  const tempDir = process.env.TEMP_PATH || resolve(process.cwd(), 'temp');
-  if (existsSync(tempDir)) {
-    const files = readdirSync(tempDir);
-    const now = Date.now();
-    let count = 0;
-    files.forEach(file => {
-      const filePath = join(tempDir, file);
-      try {
-        const stats = require('fs').statSync(filePath);
-        // Delete files older than 1 hour
-        if (now - stats.mtimeMs > 3600000) {
-          require('fs').unlinkSync(filePath);
-          count++;
-        }
-      } catch (e) { /* ignore */ }
+const clearProgress = (downloadId: string): void => {
+  downloadProgress.delete(downloadId);
+  progressEvents.emit(downloadId, NOT_FOUND_FRAME, true);
+};
+
+// Serialized `{ success, data }` bodies for cached info objects. The services
+// hand back the same object on every cache hit, so repeat /info and
+// /quick-info calls (with their large format lists) are encoded only once.
+const serializedResponses = new WeakMap<object, string>();
+
+const sendData = (res: Response, data: object): Response => {
+  let body = serializedResponses.get(data);
+  if (body === undefined) {
+    body = JSON.stringify({ success: true, data });
+    serializedResponses.set(data, body);
+  }
+  return res.type('json').send(body);
+};
+
+// Finished downloads are deleted this long after they complete
+const TEMP_FILE_TTL_MS = 3600000; // 1 hour
+
+// Web-server file offload, read once: an nginx internal location (normalized to
+// end in '/') or Apache/lighttpd X-Sendfile
+const X_ACCEL_PREFIX = (process.env.X_ACCEL_REDIRECT_PREFIX?.trim() || undefined)?.replace(/\/?$/, '/');
+const X_SENDFILE = process.env.X_SENDFILE === 'true';
+
+// File name of each finished download, recorded until the file is deleted
+const completedFiles = new Map<string, string>();
+
+/**
+ * Delete a file after the given delay. unref() so pending deletions never
+ * keep the process alive.
+ */
+const removeFileAfter = (filePath: string, delayMs: number, onRemove?: () => void): void => {
+  setTimeout(() => {
+    onRemove?.();
+    unlink(filePath).catch((error: NodeJS.ErrnoException) => {
+      if (error.code !== 'ENOENT') logger.error(`[Cleanup] Failed to remove ${filePath}:`, error);
     });
-    if (count > 0) logger.info(`[Cleanup] Removed ${count} old temp files`);
+  }, delayMs).unref();
+};
+
+/**
+ * Delete a finished download once its TTL passes
+ */
+const scheduleTempFileRemoval = (downloadId: string, filePath: string): void => {
+  completedFiles.set(downloadId, basename(filePath));
+  removeFileAfter(filePath, TEMP_FILE_TTL_MS, () => completedFiles.delete(downloadId));
+};
+
+/**
+ * Delete whatever a failed download left behind (partial fragments, .part files)
+ */
+const removeDownloadFiles = async (tempDir: string, downloadId: string): Promise<void> => {
+  try {
+    const leftovers = (await readdir(tempDir)).filter(name => name.startsWith(downloadId));
+    await Promise.allSettled(leftovers.map(name => unlink(join(tempDir, name))));
+  } catch (error) {
+    logger.error(`[Cleanup] Failed to remove files for ${downloadId}:`, error);
   }
 };
-// Run once
-// Run once
+
+const cleanupTempFiles = async (): Promise<void> => {
+  const tempDir = process.env.TEMP_PATH || resolve(process.cwd(), 'temp');
+  const now = Date.now();
+  const files: string[] = [];
+
+  try {
+    // opendir yields typed entries, so non-files are skipped without a stat call
+    for await (const entry of await opendir(tempDir)) {
+      if (entry.isFile()) files.push(join(tempDir, entry.name));
+    }
+  } catch (error) {
+    if ((error as NodeJS.ErrnoException).code !== 'ENOENT') {
+      logger.error('[Cleanup] Failed to scan temp directory:', error);
+    }
+    return;
+  }
+
+  // Issue the stats and unlinks as batches so libuv's thread pool runs them
+  // concurrently instead of one round trip per file
+  const expired = (await Promise.all(files.map(async (filePath) => {
+    try {
+      const age = now - (await stat(filePath)).mtimeMs;
+      if (age > TEMP_FILE_TTL_MS) return filePath;
+      // Not expired yet: re-arm the timer the previous run lost
+      removeFileAfter(filePath, TEMP_FILE_TTL_MS - age);
+      return null;
+    } catch (e) {
+      return null;
+    }
+  }))).filter((filePath): filePath is string => filePath !== null);
+
+  const results = await Promise.allSettled(expired.map(filePath => unlink(filePath)));
+  const count = results.filter(result => result.status === 'fulfilled').length;
+
+  if (count > 0) logger.info(`[Cleanup] Removed ${count} old temp files`);
+};
+
+// Files from a previous run have no removal timer, so on startup delete the
+// expired ones and schedule the rest for when their TTL runs out
 cleanupTempFiles();
 
 /**
@@ -62,10 +177,7 @@ export const getQuickVideoInfo = async (req: Request, res: Response, next: NextF
     console.log(`[getQuickVideoInfo] Successfully fetched: ${quickInfo.title}`);
     logger.info(`Successfully fetched quick video info: ${quickInfo.title}`);
 
-    res.json({
-      success: true,
-      data: quickInfo
-    });
+    sendData(res, quickInfo);
   } catch (error) {
     console.error('[getQuickVideoInfo] Error:', error);
     logger.error('Error in getQuickVideoInfo:', error);
@@ -113,10 +225,7 @@ export const getVideoInfo = async (req: Request, res: Response, next: NextFuncti
     console.log(`[getVideoInfo] Successfully fetched: ${videoInfo.title}`);
     logger.info(`Successfully fetched video info: ${videoInfo.title}`);
 
-    res.json({
-      success: true,
-      data: videoInfo
-    });
+    sendData(res, videoInfo);
   } catch (error) {
     console.error('[getVideoInfo] Error:', error);
     logger.error('Error in getVideoInfo:', error);
@@ -125,12 +234,34 @@ export const getVideoInfo = async (req: Request, res: Response, next: NextFuncti
   }
 };
 
+/**
+ * Invalidate cached video info so the next request re-fetches it from YouTube
+ */
+export const clearVideoInfoCache = (req: Request, res: Response): Response => {
+  const { videoId } = req.params;
+
+  if (!UrlValidator.isVideoId(videoId)) {
+    return res.status(400).json({
+      success: false,
+      error: 'Invalid video ID'
+    });
+  }
+
+  const cleared = ytdlpService.invalidateVideoInfo(videoId);
+  logger.info(`Cleared video info cache for ${videoId}: ${cleared}`);
+
+  return res.json({
+    success: true,
+    cleared
+  });
+};
+
 /**
  * Download video with progress tracking
  */
 export const downloadVideo = async (req: Request, res: Response, next: NextFunction): Promise<Response | void> => {
   try {
-    const { url, quality = '720p', audioOnly = false } = req.body;
+    const { url, quality = '720p', audioOnly = false, concurrentFragments } = req.body;
 
     if (!url) {
       return res.status(400).json({
@@ -139,12 +270,28 @@ export const downloadVideo = async (req: Request, res: Response, next: NextFunct
       });
     }
 
-    // Get video info for filename using yt-dlp
-    const videoInfo = await ytdlpService.getVideoInfo(url);
+    // Apply backpressure before doing any per-download work
+    if (!downloadQueue.hasCapacity()) {
+      res.setHeader('Retry-After', '30');
+      return res.status(429).json({
+        success: false,
+        error: 'Download queue is full. Please try again later.'
+      });
+    }
 
-    // Create sanitized filename using secure method
+    // The title only feeds the suggested filename, so never wait on yt-dlp for it.
+    // Clients fetch /info first, so it is normally cached; otherwise the queued
+    // yt-dlp run resolves the real name itself via the output template.
     const extension = audioOnly ? 'mp3' : 'mp4';
-    const filename = FilenameValidator.createSafeFilename(videoInfo.title, extension);
+    const cachedInfo = ytdlpService.getCachedVideoInfo(url);
+    let filename = `download.${extension}`;
+    if (cachedInfo) {
+      try {
+        filename = FilenameValidator.createSafeFilename(cachedInfo.title, extension);
+      } catch {
+        // Title has no filename-safe characters; keep the generic name
+      }
+    }
 
     // Generate cryptographically secure download ID
     const downloadId = IdGenerator.generateDownloadId();
@@ -168,12 +315,11 @@ export const downloadVideo = async (req: Request, res: Response, next: NextFunct
     logger.info(`Adding to queue: ${filename} (ID: ${downloadId})`);
 
     // Initialize progress tracking
-    downloadProgress.set(downloadId, {
+    setProgress(downloadId, {
       progress: 0,
       eta: 'Queued...',
       speed: '0',
       done: false,
-      maxProgress: 0,
       status: 'Queued'
     });
 
@@ -186,19 +332,19 @@ export const downloadVideo = async (req: Request, res: Response, next: NextFunct
       outputTemplate,
       // Progress callback
       (progress, eta, speed, status) => {
-        // Get current max progress to prevent backwards jumps (happens with multi-stream downloads)
+        // Progress never decreases, so the current value is also the max so far
+        // (prevents backwards jumps with multi-stream downloads)
         const current = downloadProgress.get(downloadId);
-        const currentMax = current?.maxProgress || 0;
+        const currentMax = current?.data.progress || 0;
 
         // Only update if progress is moving forward, or if it's a new download phase
         const finalProgress = Math.max(progress, currentMax);
 
-        downloadProgress.set(downloadId, {
+        setProgress(downloadId, {
           progress: finalProgress,
           eta,
           speed,
           done: false,
-          maxProgress: finalProgress,
           status: status || 'Downloading'
         });
         // Reduce log spam
@@ -207,45 +353,44 @@ export const downloadVideo = async (req: Request, res: Response, next: NextFunct
         }
       },
       // Completion callback
-      (error) => {
+      (error, filePath) => {
         if (error) {
           logger.error(`Download failed: ${downloadId}`, error);
-          downloadProgress.set(downloadId, {
+          setProgress(downloadId, {
             progress: 0,
             eta: 'Failed',
             speed: 'Error',
             done: false,
-            maxProgress: 0,
             status: 'Error'
           });
-          setTimeout(() => downloadProgress.delete(downloadId), 10000);
-          // Cleanup happens in getDownloadedFile after serving
-          // No need to delete here since we don't know the exact filename
+          setTimeout(() => clearProgress(downloadId), 10000);
+          // Nothing will ever be served, so drop partial files right away
+          removeDownloadFiles(tempDir, downloadId);
         } else {
           // Mark as complete with done flag
-          downloadProgress.set(downloadId, {
+          setProgress(downloadId, {
             progress: 100,
             eta: '00:00',
             speed: 'Complete',
             done: true,
-            maxProgress: 100,
             status: 'Completed'
           });
           logger.info(`Download complete: ${downloadId}`);
+          if (filePath) scheduleTempFileRemoval(downloadId, filePath);
 
-
-          // File will be cleaned up by periodic cleanup task based on FILE_RETENTION_HOURS  
           setTimeout(() => {
-            downloadProgress.delete(downloadId);
+            clearProgress(downloadId);
           }, 300000); // 5 minutes
         }
-      }
+      },
+      concurrentFragments
     );
 
     // Check if successfully queued
     if (!queueResult.queued) {
-      downloadProgress.delete(downloadId);
-      return res.status(503).json({
+      clearProgress(downloadId);
+      res.setHeader('Retry-After', '30');
+      return res.status(429).json({
         success: false,
         error: queueResult.error || 'Unable to queue download'
       });
@@ -308,33 +453,39 @@ export const getDownloadedFile = async (req: Request, res: Response): Promise<Re
     logger.info(`[getDownloadedFile] Looking for download ID: ${downloadId}`);
     logger.info(`[getDownloadedFile] Temp directory: ${tempDir}`);
 
-    // Check if directory exists
-    if (!existsSync(tempDir)) {
-      logger.error(`[getDownloadedFile] Directory does not exist: ${tempDir}`);
-      return res.status(404).json({
-        success: false,
-        error: 'Download directory not found'
-      });
-    }
-
-    const files = readdirSync(tempDir);
-    logger.info(`[getDownloadedFile] Files in directory: ${JSON.stringify(files)}`);
-    const targetFile = files.find((f: string) => f.startsWith(downloadId));
-
+    // Completed downloads are served by the name yt-dlp reported; the directory
+    // scan is only a fallback (e.g. for files left over from before a restart)
+    let targetFile = completedFiles.get(downloadId);
     if (!targetFile) {
-      logger.error(`[getDownloadedFile] File not found for download ID: ${downloadId}`);
-      logger.error(`[getDownloadedFile] Available files: ${files.join(', ')}`);
-      return res.status(404).json({
-        success: false,
-        error: 'Download not found or expired'
-      });
+      let files: string[];
+      try {
+        files = readdirSync(tempDir);
+      } catch (error) {
+        logger.error(`[getDownloadedFile] Directory does not exist: ${tempDir}`);
+        return res.status(404).json({
+          success: false,
+          error: 'Download directory not found'
+        });
+      }
+      logger.info(`[getDownloadedFile] Files in directory: ${JSON.stringify(files)}`);
+      targetFile = files.find((f: string) => f.startsWith(downloadId));
+
+      if (!targetFile) {
+        logger.error(`[getDownloadedFile] File not found for download ID: ${downloadId}`);
+        logger.error(`[getDownloadedFile] Available files: ${files.join(', ')}`);
+        return res.status(404).json({
+          success: false,
+          error: 'Download not found or expired'
+        });
+      }
     }
 
     const tempFile = join(tempDir, targetFile);
 
     // CRITICAL: Validate the resolved path to prevent path traversal
+    let resolvedFile: string;
     try {
-      PathValidator.validatePath(tempFile, tempDir);
+      resolvedFile = PathValidator.validatePath(tempFile, tempDir);
     } catch (error) {
       logger.error('Path traversal attempt detected:', {
         downloadId,
@@ -371,46 +522,65 @@ export const getDownloadedFile = async (req: Request, res: Response): Promise<Re
     // Sanitize filename for HTTP headers - remove problematic characters
     // Replace Unicode characters that aren't allowed in HTTP headers
     const safeFilename = filename
-      .replace(/[^\x20-\x7E]/g, '_') // Replace non-ASCII with underscore
-      .replace(/["\\]/g, '') // Remove quotes and backslashes
+      .replace(NON_PRINTABLE_ASCII_RE, '_') // Replace non-ASCII with underscore
+      .replace(QUOTES_AND_BACKSLASHES_RE, '') // Remove quotes and backslashes
       .substring(0, 200); // Limit length
 
-    // Get file size for Content-Length header (critical for proper downloads)
-    const { statSync } = require('fs');
-    const fileStats = statSync(tempFile);
-    const fileSize = fileStats.size;
-
-    // Set response headers with properly encoded filename and Content-Length
+    // Set response headers with properly encoded filename
     const contentDisposition = `attachment; filename="${safeFilename}"; filename*=UTF-8''${encodeURIComponent(filename)}`;
-
-    res.writeHead(200, {
+    const headers = {
       'Content-Type': filename.endsWith('.mp3') ? 'audio/mpeg' : 'video/mp4',
-      'Content-Length': fileSize, // CRITICAL: Tells browser exact file size
       'Content-Disposition': contentDisposition,
       'X-Suggested-Filename': encodeURIComponent(filename),
       'Access-Control-Expose-Headers': 'Content-Disposition, X-Suggested-Filename, Content-Length',
-      'Cache-Control': 'no-cache',
-      'Accept-Ranges': 'bytes' // Enable resume capability
-    });
+      'Cache-Control': 'no-cache'
+    };
+
+    // Behind nginx, hand the transfer to its internal location so the file goes
+    // out via sendfile(2) and this process is free as soon as headers are sent
+    if (X_ACCEL_PREFIX) {
+      res.writeHead(200, {
+        ...headers,
+        'X-Accel-Redirect': `${X_ACCEL_PREFIX}${encodeURIComponent(targetFile)}`
+      });
+      res.end();
+      logger.info(`File handed off to nginx: ${filename}`);
+      return;
+    }
 
-    // Stream the file
-    const fileStream = createReadStream(tempFile);
+    // Same offload for Apache (mod_xsendfile) and lighttpd, which take the
+    // absolute file path rather than an internal URI
+    if (X_SENDFILE) {
+      res.writeHead(200, {
+        ...headers,
+        'X-Sendfile': resolvedFile
+      });
+      res.end();
+      logger.info(`File handed off via X-Sendfile: ${filename}`);
+      return;
+    }
 
-    fileStream.on('error', (error) => {
-      logger.error('File stream error:', error);
-      if (!res.headersSent) {
-        res.status(500).json({
-          success: false,
-          error: 'Failed to read downloaded file'
-        });
+    // sendFile resolves the name inside root (rejecting traversal), sets
+    // Content-Length and answers Range/conditional requests so downloads can resume
+    res.sendFile(targetFile, {
+      root: tempDir,
+      headers,
+      dotfiles: 'deny',
+      acceptRanges: true,
+      cacheControl: false // Cache-Control comes from our headers
+    }, (error) => {
+      if (error) {
+        logger.error('File send error:', error);
+        if (!res.headersSent) {
+          res.status(500).json({
+            success: false,
+            error: 'Failed to read downloaded file'
+          });
+        }
+        return;
       }
-    });
-
-    fileStream.on('end', () => {
       logger.info(`File sent: ${filename}`);
     });
-
-    fileStream.pipe(res);
   } catch (error) {
     logger.error('Error in getDownloadedFile:', error);
     if (!res.headersSent) {
@@ -442,54 +612,59 @@ export const getDownloadProgress = (req: Request, res: Response): void => {
   // Send initial connection message
   res.write(`:ok\n\n`);
 
-  // Send progress updates every 300ms for more responsive updates
-  const interval = setInterval(() => {
-    const progress = downloadProgress.get(downloadId);
+  let heartbeat: NodeJS.Timeout | undefined;
 
-    if (progress) {
-      logger.info(`[getDownloadProgress] Sending progress for ${downloadId}: ${progress.progress}% (done: ${progress.done})`);
+  const stop = () => {
+    progressEvents.off(downloadId, send);
+    if (heartbeat) clearInterval(heartbeat);
+  };
 
+  const finish = () => {
+    stop();
+    // Small delay before closing to ensure last message is received
+    setTimeout(() => {
       try {
-        res.write(`data: ${JSON.stringify(progress)}\n\n`);
+        res.end();
       } catch (err) {
-        logger.error(`[getDownloadProgress] Error writing to response:`, err);
-        clearInterval(interval);
-        return;
+        logger.error(`[getDownloadProgress] Error ending response:`, err);
       }
+    }, 100);
+  };
 
-      // Close connection if download is complete
-      if (progress.done) {
-        logger.info(`[getDownloadProgress] Download complete, closing SSE connection for ${downloadId}`);
-        clearInterval(interval);
-        // Small delay before closing to ensure last message is received
-        setTimeout(() => {
-          try {
-            res.end();
-          } catch (err) {
-            logger.error(`[getDownloadProgress] Error ending response:`, err);
-          }
-        }, 100);
-      }
-    } else {
-      logger.info(`[getDownloadProgress] Download ${downloadId} not found in progress map, checking if recently completed`);
-      // Check if download was recently started (give it 2 seconds grace period)
-      // If not found and not in progress, send completion
-      res.write(`data: ${JSON.stringify({ progress: 100, eta: '00:00', speed: 'Complete', done: true })}\n\n`);
-      clearInterval(interval);
-      setTimeout(() => {
-        try {
-          res.end();
-        } catch (err) {
-          logger.error(`[getDownloadProgress] Error ending response:`, err);
-        }
-      }, 100);
+  // Pushed on every progress change instead of being polled on a timer;
+  // `close` ends the stream (download finished, or ID no longer tracked)
+  function send(frame: string, close: boolean): void {
+    try {
+      res.write(frame);
+    } catch (err) {
+      logger.error(`[getDownloadProgress] Error writing to response:`, err);
+      stop();
+      return;
     }
-  }, 300);
+
+    // Close connection once there is nothing more to report
+    if (close) {
+      logger.info(`[getDownloadProgress] Closing SSE connection for ${downloadId}`);
+      finish();
+    }
+  }
+
+  const snapshot = downloadProgress.get(downloadId);
+  if (!snapshot) {
+    logger.info(`[getDownloadProgress] Download ${downloadId} not found in progress map`);
+    send(NOT_FOUND_FRAME, true);
+    return;
+  }
+
+  progressEvents.on(downloadId, send);
+  // Comment lines keep proxies from dropping the connection while a download sits in the queue
+  heartbeat = setInterval(() => res.write(`:keepalive\n\n`), 15000);
+  send(snapshot.frame, snapshot.done);
 
   // Clean up on client disconnect
   req.on('close', () => {
     logger.info(`[getDownloadProgress] Client disconnected for ${downloadId}`);
-    clearInterval(interval);
+    stop();
   });
 };
 
@@ -510,22 +685,19 @@ export const getQualityOptions = async (req: Request, res: Response, next: NextF
 
     const videoInfo = await videoService.getVideoInfo(url);
 
-    // Extract unique quality options
-    const videoQualities = [
-      ...new Set(
-        videoInfo.formats
-          .filter(f => f.hasVideo && f.qualityLabel)
-          .map(f => f.qualityLabel)
-      )
-    ];
-
-    const audioQualities = [
-      ...new Set(
-        videoInfo.formats
-          .filter(f => f.hasAudio && !f.hasVideo && f.audioQuality)
-          .map(f => f.audioQuality)
-      )
-    ];
+    // Extract unique quality options in a single pass over the formats
+    const videoQualitySet = new Set<string>();
+    const audioQualitySet = new Set<string>();
+    for (const f of videoInfo.formats) {
+      if (f.hasVideo) {
+        if (f.qualityLabel) videoQualitySet.add(f.qualityLabel);
+      } else if (f.hasAudio && f.audioQuality) {
+        audioQualitySet.add(f.audioQuality);
+      }
+    }
+
+    const videoQualities = [...videoQualitySet];
+    const audioQualities = [...audioQualitySet];
 
     res.json({
       success: true,
@@ -1,6 +1,19 @@
 import { Request, Response, NextFunction } from 'express';
 import logger from '../utils/logger';
 
+// API_KEYS parsed into a Set on first use, re-parsed only if the variable changes
+let parsedKeysSource: string | undefined;
+let parsedKeys = new Set<string>();
+
+const getValidKeys = (): Set<string> => {
+    const source = process.env.API_KEYS;
+    if (source !== parsedKeysSource) {
+        parsedKeysSource = source;
+        parsedKeys = new Set((source || '').split(',').map(k => k.trim()).filter(Boolean));
+    }
+    return parsedKeys;
+};
+
 /**
  * API Key Authentication Middleware
  * Validates X-API-Key header against configured API keys
@@ -21,9 +34,9 @@ export const apiKeyAuth = (req: Request, res: Response, next: NextFunction): Res
     }
 
     // Get valid API keys from environment (comma-separated)
-    const validKeys = process.env.API_KEYS?.split(',').map(k => k.trim()) || [];
+    const validKeys = getValidKeys();
 
-    if (validKeys.length === 0) {
+    if (validKeys.size === 0) {
         logger.error('No API keys configured in environment');
         return res.status(500).json({
             success: false,
@@ -31,7 +44,7 @@ export const apiKeyAuth = (req: Request, res: Response, next: NextFunction): Res
         });
     }
 
-    if (!validKeys.includes(apiKey)) {
+    if (!validKeys.has(apiKey)) {
         logger.warn('Authentication failed: Invalid API key', {
             ip: req.ip,
             path: req.path,
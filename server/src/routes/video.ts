@@ -2,6 +2,7 @@ import { Router } from 'express';
 import {
   getVideoInfo,
   getQuickVideoInfo,
+  clearVideoInfoCache,
   downloadVideo,
   getQualityOptions,
   validateUrl,
@@ -11,7 +12,7 @@ import {
   getQueueStatus
 } from '../controllers/videoController';
 import { strictRateLimiter, lenientRateLimiter, noRateLimit } from '../middleware/rateLimit';
-import { optionalAuth } from '../middleware/auth';
+import { optionalAuth, apiKeyAuth } from '../middleware/auth';
 import { validateRequest, downloadSchema, urlValidationSchema, streamSchema } from '../utils/validators';
 
 const router = Router();
@@ -30,6 +31,13 @@ router.post('/quick-info', optionalAuth, strictRateLimiter, validateRequest(urlV
  */
 router.post('/info', optionalAuth, strictRateLimiter, validateRequest(urlValidationSchema), getVideoInfo);
 
+/**
+ * @route   DELETE /api/video/info/:videoId/cache
+ * @desc    Invalidate cached video information
+ * @access  Private (always requires an API key, even with REQUIRE_AUTH=false)
+ */
+router.delete('/info/:videoId/cache', apiKeyAuth, strictRateLimiter, clearVideoInfoCache);
+
 /**
  * @route   POST /api/video/download
  * @desc    Download video
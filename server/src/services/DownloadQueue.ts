@@ -8,7 +8,8 @@ interface QueuedDownload {
     audioOnly: boolean;
     outputPath: string;
     onProgress?: (progress: number, eta: string, speed: string, status?: string) => void;
-    onComplete?: (error?: Error) => void;
+    onComplete?: (error?: Error, filePath?: string) => void;
+    concurrentFragments?: number;
     addedAt: number;
     startedAt?: number;
     status: 'queued' | 'downloading' | 'completed' | 'failed';
@@ -17,6 +18,8 @@ interface QueuedDownload {
 
 class DownloadQueue {
     private queue: QueuedDownload[] = [];
+    // Index of queued items so status polls are a single lookup, not a scan
+    private queuedById: Map<string, QueuedDownload> = new Map();
     private activeDownloads: Map<string, QueuedDownload> = new Map();
     private maxConcurrent: number;
     private maxQueueSize: number;
@@ -44,10 +47,11 @@ class DownloadQueue {
         audioOnly: boolean,
         outputPath: string,
         onProgress?: (progress: number, eta: string, speed: string, status?: string) => void,
-        onComplete?: (error?: Error) => void
+        onComplete?: (error?: Error, filePath?: string) => void,
+        concurrentFragments?: number
     ): Promise<{ queued: boolean; position?: number; error?: string }> {
         // Check if queue is full
-        if (this.queue.length >= this.maxQueueSize) {
+        if (!this.hasCapacity()) {
             logger.warn(`[DownloadQueue] Queue is full (${this.queue.length}/${this.maxQueueSize})`);
             return { queued: false, error: 'Download queue is full. Please try again later.' };
         }
@@ -61,11 +65,13 @@ class DownloadQueue {
             outputPath,
             onProgress,
             onComplete,
+            concurrentFragments,
             addedAt: Date.now(),
             status: 'queued'
         };
 
         this.queue.push(queuedDownload);
+        this.queuedById.set(downloadId, queuedDownload);
         const position = this.queue.length;
 
         logger.info(`[DownloadQueue] Added download ${downloadId} to queue. Position: ${position}, Active: ${this.activeDownloads.size}/${this.maxConcurrent}`);
@@ -84,6 +90,7 @@ class DownloadQueue {
         while (this.activeDownloads.size < this.maxConcurrent && this.queue.length > 0) {
             const download = this.queue.shift();
             if (!download) break;
+            this.queuedById.delete(download.downloadId);
 
             // Update status and mark as active
             download.status = 'downloading';
@@ -105,12 +112,13 @@ class DownloadQueue {
      */
     private async startDownload(download: QueuedDownload): Promise<void> {
         try {
-            await ytdlpService.downloadVideo(
+            const filePath = await ytdlpService.downloadVideo(
                 download.url,
                 download.quality,
                 download.audioOnly,
                 download.outputPath,
-                download.onProgress
+                download.onProgress,
+                download.concurrentFragments
             );
 
             // Download completed successfully
@@ -118,7 +126,7 @@ class DownloadQueue {
             logger.info(`[DownloadQueue] Download completed: ${download.downloadId}`);
 
             if (download.onComplete) {
-                download.onComplete();
+                download.onComplete(undefined, filePath);
             }
         } catch (error) {
             // Download failed
@@ -167,10 +175,10 @@ class DownloadQueue {
             };
         }
 
-        // Check if it's in the queue
-        const queueIndex = this.queue.findIndex(d => d.downloadId === downloadId);
-        if (queueIndex !== -1) {
-            const position = queueIndex + 1;
+        // Check if it's in the queue (positions are kept current by updateQueuePositions)
+        const queued = this.queuedById.get(downloadId);
+        if (queued) {
+            const position = queued.queuePosition || this.queue.indexOf(queued) + 1;
             // Rough estimate: assume 2 minutes per download on average
             const estimatedWaitTime = position * 120000; // milliseconds
 
@@ -207,6 +215,14 @@ class DownloadQueue {
         };
     }
 
+    /**
+     * Check whether the queue can accept another download.
+     * Lets callers reject early, before doing any per-download work.
+     */
+    hasCapacity(): boolean {
+        return this.queue.length < this.maxQueueSize;
+    }
+
     /**
      * Check if a download is complete
      * Returns true if download is completed or not found in active downloads
@@ -236,6 +252,7 @@ class DownloadQueue {
             const timeInQueue = now - download.addedAt;
             if (timeInQueue > this.queueTimeout) {
                 logger.warn(`[DownloadQueue] Removing timed-out download from queue: ${download.downloadId} (waited ${Math.round(timeInQueue / 1000)}s)`);
+                this.queuedById.delete(download.downloadId);
 
                 if (download.onComplete) {
                     download.onComplete(new Error('Download request timed out in queue'));
@@ -256,10 +273,11 @@ class DownloadQueue {
      * Remove a download from the queue (if not started yet)
      */
     cancelDownload(downloadId: string): boolean {
-        const queueIndex = this.queue.findIndex(d => d.downloadId === downloadId);
+        const queued = this.queuedById.get(downloadId);
 
-        if (queueIndex !== -1) {
-            const removed = this.queue.splice(queueIndex, 1)[0];
+        if (queued) {
+            const removed = this.queue.splice(this.queue.indexOf(queued), 1)[0];
+            this.queuedById.delete(downloadId);
             logger.info(`[DownloadQueue] Cancelled queued download: ${downloadId}`);
 
             if (removed.onComplete) {
@@ -1,6 +1,6 @@
 import { UrlValidator } from '../utils/validators';
 import logger from '../utils/logger';
-import ytdlpService from './ytdlpService';
+import ytdlpService, { YtDlpVideoInfo } from './ytdlpService';
 
 export interface VideoInfo {
   videoId: string;
@@ -25,6 +25,10 @@ export interface VideoFormat {
 }
 
 class VideoService {
+  // Mapped results keyed by the cached yt-dlp object, so repeat requests skip
+  // the format loop and entries disappear with ytdlpService's cache
+  private mappedInfo = new WeakMap<YtDlpVideoInfo, VideoInfo>();
+
   /**
    * Get video information from YouTube URL
    */
@@ -41,8 +45,12 @@ class VideoService {
 
       // Get video info using yt-dlp
       const info = await ytdlpService.getVideoInfo(url);
+      const mapped = this.mappedInfo.get(info);
+      if (mapped) return mapped;
 
-      // Map yt-dlp formats to our VideoFormat interface
+      // Map yt-dlp formats to our VideoFormat interface, collecting the
+      // distinct video heights in the same pass
+      const heights = new Set<number>();
       const availableFormats: VideoFormat[] = info.formats.map((format: any) => {
         const hasVideo = !!format.vcodec && format.vcodec !== 'none';
         const hasAudio = !!format.acodec && format.acodec !== 'none';
@@ -50,6 +58,7 @@ class VideoService {
         // Extract quality label - use height if available for video formats
         let qualityLabel: string | undefined;
         if (hasVideo && format.height) {
+          heights.add(format.height);
           // Include fps in label if it's high frame rate (>30fps)
           const fps = format.fps || 30;
           qualityLabel = fps > 30 ? `${format.height}p${fps}` : `${format.height}p`;
@@ -69,20 +78,8 @@ class VideoService {
         };
       });
 
-      // Extract unique video qualities from formats
-      const videoQualities = [...new Set(
-        availableFormats
-          .filter(f => f.hasVideo && f.qualityLabel)
-          .map(f => {
-            // Extract height from qualityLabel (e.g., "720p60" -> "720")
-            const match = f.qualityLabel!.match(/\d+/);
-            return match ? parseInt(match[0]) : null;
-          })
-          .filter(h => h !== null)
-      )] as number[];
-
       // Sort qualities in descending order and convert to quality labels
-      const sortedQualities = videoQualities
+      const sortedQualities = [...heights]
         .sort((a, b) => b - a)
         .map(h => `${h}p`);
 
@@ -98,6 +95,7 @@ class VideoService {
       };
 
       logger.info(`Successfully fetched info for: ${info.title}`);
+      this.mappedInfo.set(info, videoInfo);
       return videoInfo;
     } catch (error) {
       logger.error('Error fetching video info:', error);
@@ -105,64 +103,6 @@ class VideoService {
     }
   }
 
-  /**
-   * Get best format based on quality preference
-   */
-  getBestFormat(formats: VideoFormat[], quality: string, audioOnly: boolean): VideoFormat | null {
-    try {
-      if (audioOnly) {
-        // For audio, find highest quality audio format
-        const audioFormats = formats.filter(f => f.hasAudio);
-        if (audioFormats.length === 0) return null;
-
-        // Sort by quality and return best
-        return audioFormats.sort((a, b) => {
-          const aSize = parseInt(a.contentLength || '0');
-          const bSize = parseInt(b.contentLength || '0');
-          return bSize - aSize;
-        })[0];
-      }
-
-      // For video, try to find format with both video and audio first
-      let videoFormats = formats.filter(f =>
-        f.hasVideo &&
-        f.hasAudio &&
-        f.qualityLabel?.toLowerCase().includes(quality.toLowerCase())
-      );
-
-      // If no combined format found, try any format with both video and audio
-      if (videoFormats.length === 0) {
-        videoFormats = formats.filter(f => f.hasVideo && f.hasAudio);
-      }
-
-      // If still no format found, get the best video-only format
-      if (videoFormats.length === 0) {
-        videoFormats = formats.filter(f =>
-          f.hasVideo &&
-          f.qualityLabel?.toLowerCase().includes(quality.toLowerCase())
-        );
-
-        if (videoFormats.length === 0) {
-          // Last resort: get highest quality video
-          videoFormats = formats.filter(f => f.hasVideo);
-        }
-      }
-
-      return videoFormats.length > 0 ? videoFormats[0] : null;
-    } catch (error) {
-      logger.error('Error selecting format:', error);
-      return null;
-    }
-  }
-
-  /**
-   * Get download stream for a video (deprecated - use ytdlpService directly)
-   */
-  getDownloadStream(url: string, quality: string, audioOnly: boolean) {
-    logger.warn('getDownloadStream is deprecated, use ytdlpService directly');
-    throw new Error('This method is deprecated. Use ytdlpService for downloads.');
-  }
-
   /**
    * Validate if video is available for download
    */
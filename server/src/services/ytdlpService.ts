@@ -1,8 +1,112 @@
 import logger from '../utils/logger';
 import { spawn } from 'child_process';
-import { writeFileSync, existsSync, readdirSync, statSync, mkdirSync } from 'fs';
+import { writeFileSync, existsSync, mkdirSync } from 'fs';
+import { readdir, stat } from 'fs/promises';
 import { join, dirname, basename } from 'path';
 import { tmpdir } from 'os';
+import { UrlValidator } from '../utils/validators';
+
+// Patterns compiled once at module load
+const NON_DIGIT_RE = /[^0-9]/g;
+const COOKIES_PREFIX_RE = /^YOUTUBE_COOKIES_BASE64=?\s*/;
+
+// Lines where yt-dlp reports the file it is writing; the last one is the final output
+const OUTPUT_PATH_RES = [
+  /^\[(?:download|ExtractAudio)\] Destination: (.+)$/,
+  /^\[Merger\] Merging formats into "(.+)"$/,
+  /^\[download\] (.+) has already been downloaded$/
+];
+
+// yt-dlp prints progress many times per second; clients never need more than this
+const PROGRESS_THROTTLE_MS = 200;
+
+// Machine-readable progress lines: raw bytes, bytes/s and seconds ("NA" when unknown).
+// Parsing these with split() avoids regex-scanning yt-dlp's human-readable bar.
+const PROGRESS_PREFIX = '[progress]';
+const PROGRESS_TEMPLATE = `download:${PROGRESS_PREFIX} %(progress.downloaded_bytes)s %(progress.total_bytes)s %(progress.total_bytes_estimate)s %(progress.speed)s %(progress.eta)s`;
+
+const SPEED_UNITS = ['B/s', 'KiB/s', 'MiB/s', 'GiB/s'];
+
+/**
+ * Format a bytes/second value the way yt-dlp does (e.g. "1.25MiB/s")
+ */
+const formatSpeed = (bytesPerSecond: number): string => {
+  let value = bytesPerSecond;
+  let unit = 0;
+  while (value >= 1024 && unit < SPEED_UNITS.length - 1) {
+    value /= 1024;
+    unit++;
+  }
+  return `${value.toFixed(2)}${SPEED_UNITS[unit]}`;
+};
+
+/**
+ * Format seconds as mm:ss (or hh:mm:ss for long downloads)
+ */
+const formatEta = (seconds: number): string => {
+  const total = Math.round(seconds);
+  const hours = Math.floor(total / 3600);
+  const minutes = Math.floor((total % 3600) / 60);
+  const secs = total % 60;
+  const mmss = `${String(minutes).padStart(2, '0')}:${String(secs).padStart(2, '0')}`;
+  return hours > 0 ? `${String(hours).padStart(2, '0')}:${mmss}` : mmss;
+};
+
+/**
+ * Split a stream into complete lines: the unterminated tail of each chunk is
+ * held back and prepended to the next, so no line is ever parsed in pieces
+ */
+const createLineSplitter = (onLine: (line: string) => void) => {
+  let pending = '';
+  return {
+    push(chunk: string): void {
+      const lines = (pending + chunk).split('\n');
+      pending = lines.pop() ?? '';
+      for (const line of lines) onLine(line);
+    },
+    flush(): void {
+      if (pending) onLine(pending);
+      pending = '';
+    }
+  };
+};
+
+// Upper bound on simultaneous info-extraction processes; a burst queues for a slot
+// instead of forking one yt-dlp (and one Python interpreter) per request
+const MAX_CONCURRENT_INFO = Math.max(1, parseInt(process.env.MAX_CONCURRENT_INFO_REQUESTS || '4', 10) || 4);
+
+// Metadata and format lists change rarely; googlevideo stream URLs inside the
+// formats expire after ~6h, but downloads always re-resolve them via yt-dlp
+const INFO_CACHE_TTL_MS = (parseInt(process.env.INFO_CACHE_TTL_MINUTES || '', 10) || 360) * 60 * 1000;
+
+// Parallel fragment fetches for DASH/HLS; kept moderate by default to avoid IP blocks
+const DEFAULT_CONCURRENT_FRAGMENTS = Math.max(1, parseInt(process.env.YTDLP_CONCURRENT_FRAGMENTS || '3', 10) || 3);
+
+// Optional bandwidth cap per yt-dlp process (e.g. "5M"); unset means full link speed
+const LIMIT_RATE = process.env.YTDLP_LIMIT_RATE?.trim();
+
+// Explicit ffmpeg binary; unset means yt-dlp finds ffmpeg on PATH itself
+const FFMPEG_PATH = process.env.FFMPEG_PATH?.trim();
+
+// Flags shared by every metadata lookup; each lookup only appends its own
+const INFO_BASE_ARGS: readonly string[] = [
+  '--dump-json',  // Implies --simulate: nothing is downloaded
+  '--no-warnings',
+  '--no-playlist',  // Single video only, so playlist flags never apply
+  '--retries', '1',  // Only retry once for speed
+  '--extractor-retries', '1',  // Limit extractor retries
+  '--geo-bypass',  // Bypass geo-restrictions faster
+  '--no-check-formats'  // Skip format checking for speed
+];
+
+// With -x yt-dlp already selects bestaudio/best, so no -f is needed. ffmpeg's
+// sole encode anywhere here is this MP3 (video is always stream-copied), so
+// there is no video encoder to hardware-accelerate
+const AUDIO_FORMAT_ARGS: readonly string[] = [
+  '-x',
+  '--audio-format', 'mp3',
+  '--audio-quality', '0'  // Best quality (VBR)
+];
 
 export interface YtDlpVideoInfo {
   id: string;
@@ -31,12 +135,20 @@ class YtDlpService {
 
   private cookiesFile: string | null = null;
   private cache: Map<string, { data: YtDlpVideoInfo; timestamp: number }> = new Map();
-  private cacheTTL = 15 * 60 * 1000; // 15 minutes cache for better performance
+  private cacheTTL = INFO_CACHE_TTL_MS; // Keyed by video ID, see cacheKey()
   private pendingRequests: Map<string, Promise<YtDlpVideoInfo>> = new Map(); // Request deduplication
   private quickInfoCache: Map<string, { data: Partial<YtDlpVideoInfo>; timestamp: number }> = new Map(); // Separate cache for quick info
   private quickInfoTTL = 5 * 60 * 1000; // 5 minutes for quick info
+  private pendingQuickRequests: Map<string, Promise<Partial<YtDlpVideoInfo>>> = new Map();
+  private activeInfoProcesses = 0;
+  private infoSlotWaiters: Array<() => void> = [];
 
   constructor() {
+    // Environment facts that cannot change at runtime are logged once here
+    // rather than on every yt-dlp invocation
+    console.log(`[ytdlpService] Using yt-dlp path: ${this.ytdlpPath} (platform: ${process.platform})`);
+    logger.info(`[ytdlpService] Using yt-dlp path: ${this.ytdlpPath} (platform: ${process.platform})`);
+
     // Initialize cookies from environment variable if available
     this.initializeCookies();
 
@@ -63,10 +175,9 @@ class YtDlpService {
         console.log('[ytdlpService] Found YOUTUBE_COOKIES_BASE64 environment variable');
 
         // Robustness: Strip "YOUTUBE_COOKIES_BASE64=" prefix if present (common copy-paste error)
-        const prefixRegex = /^YOUTUBE_COOKIES_BASE64=?\s*/;
-        if (prefixRegex.test(cookiesBase64.trim())) {
+        if (COOKIES_PREFIX_RE.test(cookiesBase64.trim())) {
           console.log('[ytdlpService] Stripping "YOUTUBE_COOKIES_BASE64" prefix from environment variable');
-          cookiesBase64 = cookiesBase64.trim().replace(prefixRegex, '');
+          cookiesBase64 = cookiesBase64.trim().replace(COOKIES_PREFIX_RE, '');
         }
 
         // Strip surrounding quotes if present
@@ -125,27 +236,82 @@ class YtDlpService {
   private getCommonArgs(): string[] {
     const args: string[] = [];
 
-    // Add cookies if available
+    // Add cookies if available (cookie mode is logged once by initializeCookies)
     if (this.cookiesFile && existsSync(this.cookiesFile)) {
       args.push('--cookies', this.cookiesFile);
-      console.log('[ytdlpService] Using cookies for authentication');
-    } else {
-      console.log('[ytdlpService] Using default client logic (cookie-free)');
     }
 
     // With authenticated cookies, let yt-dlp use its default client selection
     // This is more reliable than forcing mobile clients which can break extraction
-    console.log('[ytdlpService] Using yt-dlp default client selection');
-
     return args;
   }
 
+  /**
+   * Run an info-extraction task once one of the MAX_CONCURRENT_INFO slots is free
+   */
+  private async withInfoSlot<T>(task: () => Promise<T>): Promise<T> {
+    if (this.activeInfoProcesses < MAX_CONCURRENT_INFO) {
+      this.activeInfoProcesses++;
+    } else {
+      await new Promise<void>(resolve => this.infoSlotWaiters.push(resolve));
+    }
+
+    try {
+      return await task();
+    } finally {
+      // Hand the slot straight to the next waiter, or give it back
+      const next = this.infoSlotWaiters.shift();
+      if (next) {
+        next();
+      } else {
+        this.activeInfoProcesses--;
+      }
+    }
+  }
+
+  /**
+   * Get --ffmpeg-location arguments when FFMPEG_PATH is configured
+   */
+  private getFfmpegArgs(): string[] {
+    return FFMPEG_PATH ? ['--ffmpeg-location', FFMPEG_PATH] : [];
+  }
+
+  /**
+   * Cache key for a URL: the video ID, so watch/short/embed links share one entry
+   */
+  private cacheKey(url: string): string {
+    return UrlValidator.extractVideoId(url) || url.trim();
+  }
+
+  /**
+   * Drop all cached info for a video ID; returns whether anything was cached
+   */
+  invalidateVideoInfo(videoId: string): boolean {
+    const hadFull = this.cache.delete(videoId);
+    const hadQuick = this.quickInfoCache.delete(videoId);
+    // Detach in-flight fetches too: they still answer their callers, but only
+    // a fetch that is still the registered one may write to the cache
+    const hadPending = this.pendingRequests.delete(videoId);
+    const hadPendingQuick = this.pendingQuickRequests.delete(videoId);
+    return hadFull || hadQuick || hadPending || hadPendingQuick;
+  }
+
+  /**
+   * Get video information from the cache without spawning yt-dlp
+   */
+  getCachedVideoInfo(url: string): YtDlpVideoInfo | null {
+    const cached = this.cache.get(this.cacheKey(url));
+    if (cached && Date.now() - cached.timestamp < this.cacheTTL) {
+      return cached.data;
+    }
+    return null;
+  }
+
   /**
    * Get video information using yt-dlp
    */
   async getVideoInfo(url: string): Promise<YtDlpVideoInfo> {
     // Validate URL before processing to prevent command injection
-    const { UrlValidator } = await import('../utils/validators');
     try {
       url = UrlValidator.validate(url);
     } catch (error) {
@@ -154,7 +320,8 @@ class YtDlpService {
     }
 
     // Check cache first
-    const cached = this.cache.get(url);
+    const key = this.cacheKey(url);
+    const cached = this.cache.get(key);
     if (cached && Date.now() - cached.timestamp < this.cacheTTL) {
       console.log(`[ytdlpService] ⚡ Returning cached result (${Math.round((Date.now() - cached.timestamp) / 1000)}s old)`);
       logger.info('Returning cached video info');
@@ -162,7 +329,7 @@ class YtDlpService {
     }
 
     // Check if there's already a pending request for this URL (request deduplication)
-    const pending = this.pendingRequests.get(url);
+    const pending = this.pendingRequests.get(key);
     if (pending) {
       console.log(`[ytdlpService] ⏳ Returning pending request for: ${url}`);
       logger.info('Returning pending request for same URL');
@@ -170,29 +337,14 @@ class YtDlpService {
     }
 
     // Create the promise and store it for deduplication
-    const requestPromise = new Promise<YtDlpVideoInfo>((resolve, reject) => {
+    const requestPromise = this.withInfoSlot(() => new Promise<YtDlpVideoInfo>((resolve, reject) => {
       console.log(`[ytdlpService] Getting video info for: ${url}`);
-      console.log(`[ytdlpService] Using yt-dlp path: ${this.ytdlpPath}`);
-      console.log(`[ytdlpService] Platform: ${process.platform}`);
       logger.info(`[ytdlpService] Getting video info for: ${url}`);
-      logger.info(`[ytdlpService] Using yt-dlp path: ${this.ytdlpPath}`);
-      logger.info(`[ytdlpService] Platform: ${process.platform}`);
 
       const args = [
-        '--dump-json',
-        '--no-warnings',
+        ...INFO_BASE_ARGS,
         '--no-check-certificates',  // Skip certificate validation for speed
-        '--skip-download',  // We're only getting info, not downloading
-        '--no-playlist',  // Don't process playlists for speed
         '--socket-timeout', '10',  // Reduced to 10 seconds for faster failures
-        '--retries', '1',  // Only retry once for speed (was 2)
-        '--extractor-retries', '1',  // Limit extractor retries
-        '--fragment-retries', '1',  // Reduced fragment retries
-        '--flat-playlist',  // Faster playlist handling if applicable
-        '--skip-unavailable-fragments',  // Skip unavailable content
-        '--lazy-playlist',  // Don't extract playlist info upfront
-        '--geo-bypass',  // Bypass geo-restrictions faster
-        '--no-check-formats',  // Skip format checking for speed
         ...this.getCommonArgs(),
         url
       ];
@@ -240,15 +392,17 @@ class YtDlpService {
             console.log(`[ytdlpService] Successfully parsed video info: ${info.title}`);
             logger.info(`[ytdlpService] Successfully parsed video info: ${info.title}`);
 
-            // Cache the result
-            this.cache.set(url, { data: videoInfo, timestamp: Date.now() });
-            console.log(`[ytdlpService] ✅ Cached result for future requests`);
+            // Cache the result (re-inserting keeps the Map in insertion = age order),
+            // unless the entry was invalidated while this fetch was running
+            if (this.pendingRequests.get(key) === requestPromise) {
+              this.cache.delete(key);
+              this.cache.set(key, { data: videoInfo, timestamp: Date.now() });
+              console.log(`[ytdlpService] ✅ Cached result for future requests`);
 
-            // Clean up cache if it gets too large (keep last 50 entries)
-            if (this.cache.size > 50) {
-              const oldestKey = Array.from(this.cache.entries())
-                .sort((a, b) => a[1].timestamp - b[1].timestamp)[0][0];
-              this.cache.delete(oldestKey);
+              // Clean up cache if it gets too large (keep last 50 entries)
+              if (this.cache.size > 50) {
+                this.cache.delete(this.cache.keys().next().value as string);
+              }
             }
 
             resolve(videoInfo);
@@ -271,23 +425,63 @@ class YtDlpService {
       ytdlpProcess.on('error', (error) => {
         console.error('[ytdlpService] Failed to spawn yt-dlp:', error);
         logger.error('[ytdlpService] Failed to spawn yt-dlp:', error);
-        this.pendingRequests.delete(url); // Clean up pending request
         reject(new Error(`Failed to spawn yt-dlp: ${error.message}`));
       });
-    })
+    }))
       .finally(() => {
-        // Always clean up pending request when done
-        this.pendingRequests.delete(url);
+        // Always clean up pending request when done (but never a newer one
+        // registered after an invalidation)
+        if (this.pendingRequests.get(key) === requestPromise) {
+          this.pendingRequests.delete(key);
+        }
       });
 
     // Store the pending request
-    this.pendingRequests.set(url, requestPromise);
+    this.pendingRequests.set(key, requestPromise);
     return requestPromise;
   }
 
   /**
-   * Download video using yt-dlp with progress tracking
+   * Transfer tuning shared by downloads and streams: large ranged chunks and
+   * parallel fragments keep each connection busy instead of re-requesting
+   */
+  private getTransferArgs(concurrentFragments: number): string[] {
+    const args = [
+      '--buffer-size', '16K',  // Standard buffer size
+      '--http-chunk-size', '10M',  // Download in larger chunks
+      '--retries', '5',  // Increased retries
+      '--fragment-retries', '5',
+      '--concurrent-fragments', String(concurrentFragments)
+    ];
+
+    // Throttling is opt-in only, for hosts that need to stay under a bandwidth quota
+    if (LIMIT_RATE) args.push('--limit-rate', LIMIT_RATE);
+
+    return args;
+  }
+
+  /**
+   * Build the format selection args shared by downloads and streams.
+   * Prefers native MP4/M4A components so the merge is a remux, never a transcode.
    */
+  private getFormatArgs(quality: string, audioOnly: boolean): string[] {
+    if (audioOnly) return [...AUDIO_FORMAT_ARGS];
+
+    const wanted = quality.toLowerCase();
+    let formatString: string;
+    if (wanted === 'max' || wanted === 'best') {
+      formatString = 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/bestvideo+bestaudio/best';
+    } else {
+      const height = quality.replace(NON_DIGIT_RE, '');
+      // 1. MP4/M4A components at or below the height (no transcode)
+      // 2. Any components at or below the height (remux)
+      // 3. Progressive files at or below the height, then anything
+      formatString = `bestvideo[height<=${height}][ext=mp4]+bestaudio[ext=m4a]/bestvideo[height<=${height}]+bestaudio/best[height<=${height}][ext=mp4]/best[height<=${height}]/best`;
+    }
+
+    return ['-f', formatString, '--merge-output-format', 'mp4'];
+  }
+
   /**
    * Download video using yt-dlp with progress tracking
    */
@@ -296,7 +490,8 @@ class YtDlpService {
     quality: string,
     audioOnly: boolean,
     outputPath: string,
-    onProgress?: (progress: number, eta: string, speed: string, status?: string) => void
+    onProgress?: (progress: number, eta: string, speed: string, status?: string) => void,
+    concurrentFragments: number = DEFAULT_CONCURRENT_FRAGMENTS
   ): Promise<string> {
     return new Promise((resolve, reject) => {
       // Ensure directory exists
@@ -305,52 +500,24 @@ class YtDlpService {
         mkdirSync(dir, { recursive: true });
       }
 
-      // Check for ffmpeg presence (basic check)
-      // In production, we assume it's in PATH or set via --ffmpeg-location if needed
-
       const args = [
         '--no-warnings',
         '--no-playlist',
         '--newline',  // Important: Output progress on new lines for parsing
         '--progress',  // Show progress
+        '--progress-template', PROGRESS_TEMPLATE,  // Raw numbers instead of a formatted bar
         '--console-title',  // Output progress to console
-        '--buffer-size', '16K',  // Standard buffer size
-        '--http-chunk-size', '10M',  // Download in larger chunks
-        '--retries', '5',  // Increased retries
-        '--fragment-retries', '5',
-        '--concurrent-fragments', '3', // Moderate concurrency to avoid IP blocks
+        ...this.getTransferArgs(concurrentFragments),
         '--no-part',  // Don't use .part files (avoids lock issues)
         '--no-mtime',  // Don't copy mtime
+        ...this.getFfmpegArgs(),
         ...this.getCommonArgs()
       ];
 
       // Format Selection Strategy
-      if (audioOnly) {
-        // Audio Mode: Extract and convert to MP3
-        args.push('-x');
-        args.push('--audio-format', 'mp3');
-        args.push('--audio-quality', '0'); // Best quality (VBR)
-        logger.info('Mode: Audio Extraction (MP3)');
-      } else {
-        // Video Mode: Smart Selection
-        // Priority: Native MP4/M4A > Compatible Merge > Transcode
-        let formatString: string;
-
-        if (quality.toLowerCase() === 'max' || quality.toLowerCase() === 'best') {
-          // Best quality, prefer mp4 container if available to avoid remixing
-          formatString = 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/bestvideo+bestaudio/best';
-        } else {
-          const height = quality.replace(/[^0-9]/g, '');
-          // 1. Exact height MP4/M4A components (No Transcode)
-          // 2. Exact height Any Components (Remux needed)
-          // 3. Fallback to best
-          formatString = `bestvideo[height<=${height}][ext=mp4]+bestaudio[ext=m4a]/bestvideo[height<=${height}]+bestaudio/best[height<=${height}]/best`;
-        }
-
-        args.push('-f', formatString);
-        args.push('--merge-output-format', 'mp4'); // Ensure final container is MP4
-        logger.info(`Mode: Video Download (${quality}) - Format: ${formatString}`);
-      }
+      const formatArgs = this.getFormatArgs(quality, audioOnly);
+      args.push(...formatArgs);
+      logger.info(`Mode: ${audioOnly ? 'Audio Extraction (MP3)' : `Video Download (${quality})`} - ${formatArgs.join(' ')}`);
 
       args.push('-o', outputPath);
       args.push(url);
@@ -360,100 +527,116 @@ class YtDlpService {
       const ytdlpProcess = spawn(this.ytdlpPath, args);
       let stderr = '';
       let currentStatus = 'Downloading';
-
-      const parseOutput = (data: string) => {
-        const lines = data.toString().split('\n');
-        for (const line of lines) {
-          if (!line.trim()) continue;
-
-          // 1. Detect Status Changes
-          if (line.includes('[Merger]')) {
-            currentStatus = 'Merging';
-            if (onProgress) onProgress(99, '00:00', 'Processing', currentStatus);
-            logger.info('Status: Merging files');
-          } else if (line.includes('[ExtractAudio]')) {
-            currentStatus = 'Converting';
-            if (onProgress) onProgress(99, '00:00', 'Processing', currentStatus);
-            logger.info('Status: Extracting Audio');
-          } else if (line.includes('[FixupM3u8]')) {
-            currentStatus = 'Finalizing';
-            logger.info('Status: Fixing Container');
+      let lastProgressAt = 0;
+      let finalPath: string | null = null;
+
+      // Handles one complete line of yt-dlp output
+      const parseLine = (rawLine: string) => {
+        const line = rawLine.trim();
+        if (!line) return;
+        const progressIndex = line.indexOf(PROGRESS_PREFIX);
+
+        // 0. Track the output file as yt-dlp reports it (progress lines, by far
+        // the most frequent, never carry a path)
+        if (progressIndex === -1) {
+          for (const re of OUTPUT_PATH_RES) {
+            const pathMatch = re.exec(line);
+            if (pathMatch) {
+              finalPath = pathMatch[1];
+              break;
+            }
           }
+        }
 
-          // 2. Parse Progress
-          if (onProgress && line.includes('[download]')) {
-            const progressMatch = line.match(/\[download\]\s+(\d+\.?\d*)%/);
-            if (progressMatch) {
-              const progress = parseFloat(progressMatch[1]);
-
-              let eta = 'Unknown';
-              const etaMatch = line.match(/ETA\s+(\d+:\d+)/);
-              if (etaMatch) eta = etaMatch[1];
-
-              let speed = '0';
-              const speedMatch = line.match(/at\s+([\d\.]+[KMG]iB\/s)/);
-              if (speedMatch) speed = speedMatch[1];
-
-              // If we are strictly in "download" phase, pass through.
-              // If we are getting download updates but status was "Merging", it might be a second pass, reset status
-              if (currentStatus !== 'Downloading' && progress < 100) {
-                currentStatus = 'Downloading';
-              }
+        // 1. Detect Status Changes
+        if (line.includes('[Merger]')) {
+          currentStatus = 'Merging';
+          if (onProgress) onProgress(99, '00:00', 'Processing', currentStatus);
+          logger.info('Status: Merging files');
+        } else if (line.includes('[ExtractAudio]')) {
+          currentStatus = 'Converting';
+          if (onProgress) onProgress(99, '00:00', 'Processing', currentStatus);
+          logger.info('Status: Extracting Audio');
+        } else if (line.includes('[FixupM3u8]')) {
+          currentStatus = 'Finalizing';
+          logger.info('Status: Fixing Container');
+        }
 
-              onProgress(progress, eta, speed, currentStatus);
+        // 2. Parse Progress
+        if (onProgress && progressIndex !== -1) {
+          const [downloaded, total, totalEstimate, rawSpeed, rawEta] = line
+            .slice(progressIndex + PROGRESS_PREFIX.length)
+            .trim()
+            .split(' ')
+            .map(Number);
+
+          const size = total || totalEstimate;
+          if (downloaded >= 0 && size > 0) {
+            const progress = Math.min(100, Math.round((downloaded / size) * 1000) / 10);
+
+            // Drop intermediate ticks, but always let a finished stream through
+            const now = Date.now();
+            if (progress < 100 && now - lastProgressAt < PROGRESS_THROTTLE_MS) return;
+            lastProgressAt = now;
+
+            const eta = rawEta >= 0 ? formatEta(rawEta) : 'Unknown';
+            const speed = rawSpeed > 0 ? formatSpeed(rawSpeed) : '0';
+
+            // If we are strictly in "download" phase, pass through.
+            // If we are getting download updates but status was "Merging", it might be a second pass, reset status
+            if (currentStatus !== 'Downloading' && progress < 100) {
+              currentStatus = 'Downloading';
             }
+
+            onProgress(progress, eta, speed, currentStatus);
           }
         }
       };
 
-      ytdlpProcess.stdout.on('data', parseOutput);
-      ytdlpProcess.stderr.on('data', (data) => {
-        stderr += data.toString();
+      // Chunks can end mid-line, so each stream gets its own line buffer;
+      // utf8 decoding keeps multi-byte characters in titles/paths intact
+      const stdoutLines = createLineSplitter(parseLine);
+      const stderrLines = createLineSplitter(parseLine);
+      ytdlpProcess.stdout.setEncoding('utf8');
+      ytdlpProcess.stderr.setEncoding('utf8');
+
+      ytdlpProcess.stdout.on('data', (data: string) => stdoutLines.push(data));
+      ytdlpProcess.stderr.on('data', (data: string) => {
+        stderr += data;
         // Sometimes progress is in stderr
-        parseOutput(data.toString());
+        stderrLines.push(data);
       });
 
-      ytdlpProcess.on('close', (code) => {
+      ytdlpProcess.on('close', async (code) => {
+        // Output may end without a trailing newline
+        stdoutLines.flush();
+        stderrLines.flush();
+
         if (code === 0) {
-          // Give filesystem a moment to flush writes (especially important on cloud platforms)
-          setTimeout(() => {
-            // Verify file existence
-            // With templates, we need to find the actual file created by yt-dlp
-            const dir = dirname(outputPath);
-            const expectedPrefix = basename(outputPath).split('%(')[0]; // Get the downloadId- part
-
-            logger.info(`Looking for file with prefix: "${expectedPrefix}" in ${dir}`);
-
-            try {
-              const files = readdirSync(dir);
-              logger.info(`Files in directory: ${JSON.stringify(files)}`);
-
-              const matchingFile = files.find((f: string) => f.startsWith(expectedPrefix));
-
-              if (matchingFile) {
-                const actualPath = join(dir, matchingFile);
-                const stats = statSync(actualPath);
-
-                logger.info(`Found file: ${matchingFile}, Size: ${stats.size} bytes`);
-
-                if (stats.size > 0) {
-                  logger.info(`Download success: ${actualPath} (${stats.size} bytes)`);
-                  if (onProgress) onProgress(100, '00:00', 'Complete', 'Completed');
-                  resolve(actualPath);
-                  return;
-                } else {
-                  logger.error(`File exists but is empty: ${actualPath}`);
-                }
-              } else {
-                logger.error(`No file found with prefix: ${expectedPrefix}`);
-                logger.error(`Available files: ${files.join(', ')}`);
-              }
-            } catch (err) {
-              logger.error('Error checking download file:', err);
+          // 'close' fires after yt-dlp has exited and its stdio is drained, so its
+          // output is already closed on disk - verify it right away (async, so
+          // other requests keep being served)
+          // Use the path yt-dlp reported; scan the directory if it never did, or
+          // if that path turns out to be missing or empty
+          let actualPath = finalPath;
+          let size = await this.getFileSize(actualPath);
+          if (size === 0) {
+            const scanned = await this.findOutputFile(outputPath);
+            if (scanned && scanned !== actualPath) {
+              actualPath = scanned;
+              size = await this.getFileSize(scanned);
             }
+          }
 
-            reject(new Error('Download finished but file is missing or empty'));
-          }, 500); // 500ms delay to ensure file writes are flushed
+          if (actualPath && size > 0) {
+            logger.info(`Download success: ${actualPath} (${size} bytes)`);
+            if (onProgress) onProgress(100, '00:00', 'Complete', 'Completed');
+            resolve(actualPath);
+            return;
+          }
+
+          logger.error(`Output file missing or empty: ${actualPath || outputPath}`);
+          reject(new Error('Download finished but file is missing or empty'));
         } else {
           logger.error('yt-dlp failed:', stderr);
           reject(new Error(`Download failed with code ${code}`));
@@ -466,6 +649,40 @@ class YtDlpService {
     });
   }
 
+  /**
+   * Size of a file in bytes, or 0 if there is no path or it cannot be stat'ed
+   */
+  private async getFileSize(filePath: string | null): Promise<number> {
+    if (!filePath) return 0;
+    try {
+      return (await stat(filePath)).size;
+    } catch (err) {
+      logger.error(`Error checking download file ${filePath}:`, err);
+      return 0;
+    }
+  }
+
+  /**
+   * Find the file yt-dlp created from an output template by its downloadId prefix.
+   * Fallback for when the output path could not be read from yt-dlp's log.
+   */
+  private async findOutputFile(outputTemplate: string): Promise<string | null> {
+    const dir = dirname(outputTemplate);
+    const expectedPrefix = basename(outputTemplate).split('%(')[0]; // Get the downloadId- part
+
+    logger.info(`Looking for file with prefix: "${expectedPrefix}" in ${dir}`);
+
+    try {
+      const matchingFile = (await readdir(dir)).find((f: string) => f.startsWith(expectedPrefix));
+      if (matchingFile) return join(dir, matchingFile);
+      logger.error(`No file found with prefix: ${expectedPrefix}`);
+    } catch (err) {
+      logger.error('Error checking download file:', err);
+    }
+
+    return null;
+  }
+
   /**
    * Stream download directly to response
    */
@@ -473,29 +690,13 @@ class YtDlpService {
     const args = [
       '--no-warnings',
       '--no-playlist',
+      ...this.getTransferArgs(DEFAULT_CONCURRENT_FRAGMENTS),
+      ...this.getFfmpegArgs(),
       ...this.getCommonArgs(),
       '-o', '-'
     ];
 
-    if (audioOnly) {
-      args.push('-x', '--audio-format', 'mp3', '--audio-quality', '0');
-    } else {
-      // Use the same improved format selection as regular download
-      let formatString: string;
-
-      if (quality.toLowerCase() === 'max' || quality.toLowerCase() === 'best') {
-        // Best available quality without restrictions
-        formatString = 'bestvideo+bestaudio/best';
-      } else {
-        // Extract height from quality string
-        const height = quality.replace(/[^0-9]/g, '');
-        formatString = `bestvideo[height<=${height}][ext=mp4]+bestaudio[ext=m4a]/bestvideo[height<=${height}]+bestaudio/best[height<=${height}][ext=mp4]/best[height<=${height}]/best`;
-      }
-
-      args.push('-f', formatString);
-      args.push('--merge-output-format', 'mp4');
-    }
-
+    args.push(...this.getFormatArgs(quality, audioOnly));
     args.push(url);
 
     logger.info(`Streaming download: ${audioOnly ? 'audio' : quality}`);
@@ -523,32 +724,32 @@ class YtDlpService {
    */
   async getQuickVideoInfo(url: string): Promise<Partial<YtDlpVideoInfo>> {
     // Check quick info cache first
-    const quickCached = this.quickInfoCache.get(url);
+    const key = this.cacheKey(url);
+    const quickCached = this.quickInfoCache.get(key);
     if (quickCached && Date.now() - quickCached.timestamp < this.quickInfoTTL) {
       console.log(`[ytdlpService] ⚡ Returning cached quick info (${Math.round((Date.now() - quickCached.timestamp) / 1000)}s old)`);
       return Promise.resolve(quickCached.data);
     }
 
     // Check full cache as fallback
-    const cached = this.cache.get(url);
+    const cached = this.cache.get(key);
     if (cached && Date.now() - cached.timestamp < this.cacheTTL) {
       return cached.data;
     }
 
-    return new Promise((resolve, reject) => {
+    // Share an in-flight request for the same URL (request deduplication);
+    // a pending full fetch is a superset, so reuse that too
+    const pending = this.pendingQuickRequests.get(key) || this.pendingRequests.get(key);
+    if (pending) {
+      return pending;
+    }
+
+    const requestPromise = this.withInfoSlot(() => new Promise<Partial<YtDlpVideoInfo>>((resolve, reject) => {
       const args = [
-        '--dump-json',
-        '--no-warnings',
-        '--skip-download',
-        '--no-playlist',
+        ...INFO_BASE_ARGS,
         '--socket-timeout', '8',  // Aggressive 8 second timeout
-        '--retries', '1',  // Only one retry
-        '--extractor-retries', '1',
-        '--flat-playlist',  // Don't extract full playlist info
-        '--lazy-playlist',  // Even faster playlist handling
-        '--no-check-formats',  // Skip format validation
-        '--geo-bypass',  // Quick geo-bypass
-        '--print-json',  // Print JSON immediately
+        '--extractor-args', 'youtube:skip=hls,dash',  // Formats are discarded, so don't fetch their manifests
+        '--ignore-no-formats-error',  // Live streams/premieres may only offer the skipped formats
         ...this.getCommonArgs(),
         url
       ];
@@ -574,15 +775,17 @@ class YtDlpService {
               formats: [], // Empty for quick fetch
             };
 
-            // Cache the quick info result
-            this.quickInfoCache.set(url, { data: quickInfo, timestamp: Date.now() });
-            console.log(`[ytdlpService] ✅ Cached quick info for future requests`);
+            // Cache the quick info result (re-inserting keeps the Map in age order),
+            // unless the entry was invalidated while this fetch was running
+            if (this.pendingQuickRequests.get(key) === requestPromise) {
+              this.quickInfoCache.delete(key);
+              this.quickInfoCache.set(key, { data: quickInfo, timestamp: Date.now() });
+              console.log(`[ytdlpService] ✅ Cached quick info for future requests`);
 
-            // Clean up quick info cache if it gets too large (keep last 100 entries)
-            if (this.quickInfoCache.size > 100) {
-              const oldestKey = Array.from(this.quickInfoCache.entries())
-                .sort((a, b) => a[1].timestamp - b[1].timestamp)[0][0];
-              this.quickInfoCache.delete(oldestKey);
+              // Clean up quick info cache if it gets too large (keep last 100 entries)
+              if (this.quickInfoCache.size > 100) {
+                this.quickInfoCache.delete(this.quickInfoCache.keys().next().value as string);
+              }
             }
 
             resolve(quickInfo);
@@ -597,7 +800,15 @@ class YtDlpService {
       ytdlpProcess.on('error', (error) => {
         reject(error);
       });
-    });
+    }))
+      .finally(() => {
+        if (this.pendingQuickRequests.get(key) === requestPromise) {
+          this.pendingQuickRequests.delete(key);
+        }
+      });
+
+    this.pendingQuickRequests.set(key, requestPromise);
+    return requestPromise;
   }
 
   /**
@@ -4,16 +4,31 @@ import { resolve, normalize, sep } from 'path';
 import sanitize from 'sanitize-filename';
 import logger from '../utils/logger';
 
+// Patterns used on every request, compiled once at module load
+const IPV4_RE = /^\d+\.\d+\.\d+\.\d+$/;
+const SHELL_METACHARS_RE = /[;<>|&$`\\!]/;
+const UNSAFE_FILENAME_CHARS_RE = /[^a-zA-Z0-9_\-]/g;
+const REPEATED_UNDERSCORES_RE = /_+/g;
+const EDGE_UNDERSCORES_RE = /^_+|_+$/g;
+const VIDEO_ID_IN_URL_RE = /(?:[?&]v=|youtu\.be\/|\/(?:shorts|embed|live)\/)([\w-]{11})(?![\w-])/;
+const VIDEO_ID_RE = /^[\w-]{11}$/;
+const DOWNLOAD_ID_RE = /^[a-zA-Z0-9\-]+$/;
+
+const ALLOWED_PROTOCOLS = new Set(['http:', 'https:']);
+
+// Upper bound for the per-request concurrentFragments option (.env is loaded before import)
+const MAX_CONCURRENT_FRAGMENTS = Math.max(1, parseInt(process.env.YTDLP_MAX_CONCURRENT_FRAGMENTS || '8', 10) || 8);
+
 /**
  * URL Validator - Prevents SSRF and injection attacks
  */
 export class UrlValidator {
-  private static readonly ALLOWED_DOMAINS = [
+  private static readonly ALLOWED_DOMAINS = new Set([
     'youtube.com',
     'www.youtube.com',
     'youtu.be',
     'm.youtube.com'
-  ];
+  ]);
 
   /**
    * Validate and sanitize YouTube URL
@@ -35,17 +50,17 @@ export class UrlValidator {
     }
 
     // Check protocol
-    if (!['http:', 'https:'].includes(parsed.protocol)) {
+    if (!ALLOWED_PROTOCOLS.has(parsed.protocol)) {
       throw new Error('Only HTTP/HTTPS protocols are allowed');
     }
 
     // Check domain
-    if (!this.ALLOWED_DOMAINS.includes(parsed.hostname.toLowerCase())) {
+    if (!this.ALLOWED_DOMAINS.has(parsed.hostname.toLowerCase())) {
       throw new Error('Only YouTube URLs are allowed');
     }
 
     // Prevent IP-based URLs
-    if (/^\d+\.\d+\.\d+\.\d+$/.test(parsed.hostname)) {
+    if (IPV4_RE.test(parsed.hostname)) {
       throw new Error('IP addresses are not allowed');
     }
 
@@ -55,8 +70,7 @@ export class UrlValidator {
     }
 
     // Additional security: ensure no shell metacharacters
-    const dangerous = /[;<>|&$`\\!]/;
-    if (dangerous.test(url)) {
+    if (SHELL_METACHARS_RE.test(url)) {
       throw new Error('URL contains invalid characters');
     }
 
@@ -68,6 +82,21 @@ export class UrlValidator {
     return url;
   }
 
+  /**
+   * Extract the 11-character YouTube video ID, or null if the URL has none
+   */
+  static extractVideoId(url: string): string | null {
+    const match = VIDEO_ID_IN_URL_RE.exec(url);
+    return match ? match[1] : null;
+  }
+
+  /**
+   * Check that a string is a bare YouTube video ID
+   */
+  static isVideoId(value: string): boolean {
+    return VIDEO_ID_RE.test(value);
+  }
+
   /**
    * Sanitize URL for logging (remove sensitive parts)
    */
@@ -117,7 +146,7 @@ export class PathValidator {
     }
 
     // Only allow alphanumeric characters and hyphens
-    if (!/^[a-zA-Z0-9\-]+$/.test(downloadId)) {
+    if (!DOWNLOAD_ID_RE.test(downloadId)) {
       throw new Error('Invalid download ID format');
     }
 
@@ -134,7 +163,7 @@ export class PathValidator {
  * Filename Validator - Secure filename generation
  */
 export class FilenameValidator {
-  private static readonly ALLOWED_EXTENSIONS = ['mp4', 'mp3', 'webm'];
+  private static readonly ALLOWED_EXTENSIONS = new Set(['mp4', 'mp3', 'webm']);
 
   /**
    * Create safe filename from title and extension
@@ -142,15 +171,15 @@ export class FilenameValidator {
   static createSafeFilename(title: string, extension: string): string {
     // Validate extension
     const lowerExt = extension.toLowerCase();
-    if (!this.ALLOWED_EXTENSIONS.includes(lowerExt)) {
+    if (!this.ALLOWED_EXTENSIONS.has(lowerExt)) {
       throw new Error(`Invalid file extension: ${extension}`);
     }
 
     // Sanitize title - remove all special characters including dots
     const safeTitle = sanitize(title)
-      .replace(/[^a-zA-Z0-9_\-]/g, '_')
-      .replace(/_+/g, '_') // Replace multiple underscores with single
-      .replace(/^_+|_+$/g, '') // Remove leading/trailing underscores
+      .replace(UNSAFE_FILENAME_CHARS_RE, '_')
+      .replace(REPEATED_UNDERSCORES_RE, '_') // Replace multiple underscores with single
+      .replace(EDGE_UNDERSCORES_RE, '') // Remove leading/trailing underscores
       .substring(0, 100); // Limit length
 
     if (!safeTitle) {
@@ -173,6 +202,13 @@ export class IdGenerator {
     return crypto.randomBytes(32).toString('hex');
   }
 
+  /**
+   * Generate request ID for log correlation
+   */
+  static generateRequestId(): string {
+    return crypto.randomBytes(16).toString('hex');
+  }
+
   /**
    * Generate secure API key
    */
@@ -199,7 +235,13 @@ export const downloadSchema = Joi.object({
   quality: Joi.string()
     .valid('144p', '240p', '360p', '480p', '720p', '1080p', '1440p', '2160p', '4320p', 'max', 'best')
     .default('720p'),
-  audioOnly: Joi.boolean().default(false)
+  audioOnly: Joi.boolean().default(false),
+  // Lower this for sites that throttle parallel fragment requests
+  concurrentFragments: Joi.number()
+    .integer()
+    .min(1)
+    .max(MAX_CONCURRENT_FRAGMENTS)
+    .optional()
 });
 
 export const urlValidationSchema = Joi.object({